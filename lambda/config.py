@@ -20,6 +20,8 @@ class Config:
     # AWS Settings
     AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
     S3_BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', '')
+    S3_TRANSFER_CHUNK_SIZE = 1 * 1024 * 1024  # 1MB multipart ranges
+    S3_TRANSFER_MAX_CONCURRENCY = 8  # parallel ranged GETs per download
 
     # Database Settings
     DB_HOST = os.environ.get('DB_HOST', '')
@@ -27,6 +29,10 @@ class Config:
     DB_NAME = os.environ.get('DB_NAME', 'doctalk')
     DB_USER = os.environ.get('DB_USER', 'postgres')
     DB_PASSWORD = os.environ.get('DB_PASSWORD', '')
+    DB_POOL_MIN_CONNECTIONS = 1
+    DB_POOL_MAX_CONNECTIONS = 4
+    DB_POOL_PROBE_IDLE_SECONDS = 30  # probe connections idle longer than this
+    DB_POOL_TIMEOUT_SECONDS = 60  # max wait for a free pooled connection (well within the Lambda timeout)
 
     @classmethod
     def get_database_url(cls) -> str:
@@ -36,14 +42,19 @@ class Config:
     # OpenAI Settings
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
     OPENAI_EMBEDDING_MODEL = 'text-embedding-3-small'  # 1536 dimensions
+    EMBEDDING_BATCH_SIZE = 256  # texts per embedding request
+    EMBEDDING_MAX_WORKERS = 8  # concurrent embedding requests
+    EMBEDDING_MAX_RETRIES = 5  # attempts per batch on rate limit errors
 
-    # Chunking Settings (LangChain RecursiveCharacterTextSplitter)
-    CHUNK_SIZE = 1000  # characters (roughly ~250 tokens)
-    CHUNK_OVERLAP = 200  # characters
+    # Chunking Settings (LangChain RecursiveCharacterTextSplitter, tiktoken lengths)
+    CHUNK_ENCODING = 'cl100k_base'  # tokenizer used by text-embedding-3-small
+    CHUNK_SIZE = 400  # tokens (roughly ~1600 characters)
+    CHUNK_OVERLAP = 50  # tokens
 
     # Processing Settings
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
     TEMP_DIR = '/tmp'  # Lambda temp directory
+    MAX_CONCURRENT_DOCUMENTS = 10  # SQS records processed in parallel
 
     # Supported File Types
     SUPPORTED_FILE_TYPES = {
@@ -74,3 +85,9 @@ class Config:
             raise ValueError(
                 f"Missing required environment variables: {', '.join(missing)}"
             )
+
+
+# Validate once per container at import time (fails the cold start instead of
+# every invocation); set SKIP_CONFIG_VALIDATION=1 to import without credentials
+if os.environ.get('SKIP_CONFIG_VALIDATION') != '1':
+    Config.validate_config()
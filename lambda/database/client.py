@@ -1,11 +1,19 @@
 """
 Database connection management for DocTalk Lambda document processor.
 
-Manages PostgreSQL connections with connection reuse optimization for Lambda.
+Manages a pool of PostgreSQL connections that is reused across Lambda
+invocations and shared by the worker threads of a single invocation.
 """
-import psycopg2
-from psycopg2.extensions import connection as Connection
-from typing import Optional
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import psycopg
+from pgvector.psycopg import register_vector
+from psycopg import Connection
+from psycopg_pool import ConnectionPool
 
 from config import Config
 from utils.logger import get_logger
@@ -13,64 +21,127 @@ from utils.exceptions import DatabaseError
 
 logger = get_logger(__name__)
 
-# Global connection for reuse across Lambda invocations
-_global_connection: Optional[Connection] = None
+# Global connection pool for reuse across Lambda invocations
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
 
+# When each pooled connection was last returned (keyed by id(connection))
+_last_released: Dict[int, float] = {}
 
-def get_db_connection() -> Connection:
+
+def _configure_connection(conn: Connection) -> None:
+    """
+    Pool configure callback: prepare a newly opened connection.
+
+    Registers the pgvector type so embeddings can be sent as numpy arrays,
+    including in binary COPY.
+
+    Args:
+        conn: Connection just opened by the pool
+    """
+    register_vector(conn)
+
+
+def _mark_released(conn: Connection) -> None:
+    """
+    Pool reset callback: remember when a connection was returned.
+
+    Args:
+        conn: Connection being returned to the pool
+    """
+    _last_released[id(conn)] = time.monotonic()
+
+
+def _check_connection(conn: Connection) -> None:
+    """
+    Pool check callback: make sure a connection is still usable.
+
+    Connections that were returned recently are trusted; connections that
+    have sat idle (e.g. across a frozen Lambda container) are probed with
+    SELECT 1, since RDS may have dropped them in the meantime. The pool
+    discards the connection and hands out another if the probe fails.
+
+    Args:
+        conn: Connection about to be checked out
+
+    Raises:
+        psycopg.OperationalError: If the connection is dead
     """
-    Get a PostgreSQL database connection.
+    released_at = _last_released.pop(id(conn), None)
+    if released_at is None or time.monotonic() - released_at < Config.DB_POOL_PROBE_IDLE_SECONDS:
+        return
+
+    conn.execute("SELECT 1")
 
-    Lambda best practice: Reuse connections across invocations by storing
-    in global scope. This significantly reduces cold start overhead.
+
+def _get_pool() -> ConnectionPool:
+    """
+    Get the global connection pool, creating it on first use.
 
     Returns:
-        psycopg2 connection object
+        psycopg_pool ConnectionPool
 
     Raises:
-        DatabaseError: If connection fails
+        psycopg.OperationalError: If the pool cannot be opened
     """
-    global _global_connection
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            logger.info("Creating database connection pool")
+
+            connection_params = {
+                'host': Config.DB_HOST,
+                'port': Config.DB_PORT,
+                'dbname': Config.DB_NAME,
+                'user': Config.DB_USER,
+                'password': Config.DB_PASSWORD,
+                'connect_timeout': 10,
+                'sslmode': 'require',  # Required for AWS RDS
+                'autocommit': True
+            }
+
+            _pool = ConnectionPool(
+                kwargs=connection_params,
+                min_size=Config.DB_POOL_MIN_CONNECTIONS,
+                max_size=Config.DB_POOL_MAX_CONNECTIONS,
+                timeout=Config.DB_POOL_TIMEOUT_SECONDS,
+                configure=_configure_connection,
+                check=_check_connection,
+                reset=_mark_released,
+                open=True
+            )
+
+            logger.info("Database connection pool created successfully")
 
+        return _pool
+
+
+def get_db_connection() -> Connection:
+    """
+    Check out a PostgreSQL connection from the global pool.
+
+    Lambda best practice: Reuse connections across invocations by keeping
+    the pool in global scope. This significantly reduces cold start overhead.
+    Every connection must be handed back with release_db_connection().
+    When all connections are in use, the call waits for one to be returned,
+    for at most Config.DB_POOL_TIMEOUT_SECONDS.
+
+    Connections are in autocommit mode, so single statements cost one round
+    trip; use transaction() when several statements must commit together.
+
+    Returns:
+        psycopg connection object
+
+    Raises:
+        DatabaseError: If connection fails or no connection frees up in time
+    """
     try:
-        # Check if we have an existing connection
-        if _global_connection is not None:
-            # Verify connection is still alive
-            try:
-                _global_connection.isolation_level
-                logger.debug("Reusing existing database connection")
-                return _global_connection
-            except (psycopg2.OperationalError, psycopg2.InterfaceError):
-                # Connection is dead, close it and create new one
-                logger.info("Existing connection is dead, creating new connection")
-                try:
-                    _global_connection.close()
-                except Exception:
-                    pass
-                _global_connection = None
-
-        # Create new connection
-        logger.info("Creating new database connection")
-
-        connection_params = {
-            'host': Config.DB_HOST,
-            'port': Config.DB_PORT,
-            'dbname': Config.DB_NAME,
-            'user': Config.DB_USER,
-            'password': Config.DB_PASSWORD,
-            'connect_timeout': 10,
-            'sslmode': 'require'  # Required for AWS RDS
-        }
-
-        _global_connection = psycopg2.connect(**connection_params)
-
-        # Set connection parameters
-        _global_connection.set_session(autocommit=False)
-
-        logger.info("Database connection established successfully")
-        return _global_connection
-
-    except psycopg2.OperationalError as e:
+        conn = _get_pool().getconn()
+        logger.debug("Checked out database connection from pool")
+        return conn
+
+    except psycopg.Error as e:
         error_msg = f"Failed to connect to database: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise DatabaseError(error_msg)
@@ -81,24 +152,96 @@ def get_db_connection() -> Connection:
         raise DatabaseError(error_msg)
 
 
+def release_db_connection(conn: Connection) -> None:
+    """
+    Return a connection to the global pool.
+
+    Any transaction still open on the connection is rolled back by the pool.
+
+    Args:
+        conn: Connection obtained from get_db_connection()
+    """
+    try:
+        if _pool is not None and not _pool.closed:
+            _pool.putconn(conn)
+        else:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"Error releasing database connection: {str(e)}")
+
+
+@contextmanager
+def db_connection(conn: Optional[Connection] = None) -> Iterator[Connection]:
+    """
+    Context manager that provides a database connection.
+
+    If a connection is passed in it is used as-is and left open, so several
+    operations can share one transaction. Otherwise a connection is checked
+    out of the pool and released on exit.
+
+    Args:
+        conn: Optional connection owned by the caller
+
+    Yields:
+        psycopg connection object
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        release_db_connection(conn)
+
+
+@contextmanager
+def transaction(conn: Optional[Connection] = None) -> Iterator[Connection]:
+    """
+    Context manager that provides a connection inside a transaction.
+
+    If a connection is passed in, it must already be inside the caller's
+    transaction and is used as-is. Otherwise a connection is checked out of
+    the pool, committed on success or rolled back on error, and released.
+
+    Args:
+        conn: Optional connection whose transaction is owned by the caller
+
+    Yields:
+        psycopg connection object
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    with db_connection() as conn, conn.transaction():
+        yield conn
+
+
 def close_connection() -> None:
     """
-    Close the global database connection.
+    Close all connections in the global pool.
 
     This should typically only be called during testing or in error scenarios.
-    Lambda will automatically clean up connections when the execution environment
-    is terminated.
+    It is also registered with atexit so connections are closed when the
+    execution environment shuts down.
     """
-    global _global_connection
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            try:
+                _pool.close()
+                logger.info("Database connection pool closed")
+            except Exception as e:
+                logger.warning(f"Error closing database connection pool: {str(e)}")
+            finally:
+                _pool = None
+                _last_released.clear()
+
 
-    if _global_connection is not None:
-        try:
-            _global_connection.close()
-            logger.info("Database connection closed")
-        except Exception as e:
-            logger.warning(f"Error closing database connection: {str(e)}")
-        finally:
-            _global_connection = None
+atexit.register(close_connection)
 
 
 def test_connection() -> bool:
@@ -112,8 +255,7 @@ def test_connection() -> bool:
         DatabaseError: If connection test fails
     """
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        with db_connection() as conn, conn.cursor() as cur:
             cur.execute("SELECT 1")
             result = cur.fetchone()
             if result and result[0] == 1:
@@ -4,23 +4,32 @@ Database CRUD operations for DocTalk Lambda document processor.
 Handles all database interactions including document status updates
 and chunk storage.
 """
-import psycopg2
-from psycopg2.extras import execute_batch, Json
-from typing import List, Optional, Dict, Any
+import uuid
+from functools import lru_cache
 
-from database.client import get_db_connection
+import numpy as np
+import psycopg
+from psycopg import Connection
+from psycopg.types.json import Jsonb
+from typing import List, Optional, Dict, Any, Union
+
+from database.client import db_connection, transaction
 from utils.logger import get_logger
 from utils.exceptions import DatabaseError
 
 logger = get_logger(__name__)
 
 
-def get_document_by_s3_key(s3_key: str) -> Optional[Dict[str, Any]]:
+def get_document_by_s3_key(
+    s3_key: str,
+    conn: Optional[Connection] = None
+) -> Optional[Dict[str, Any]]:
     """
     Query document by S3 key to get document metadata.
 
     Args:
         s3_key: S3 object key (e.g., 'uploads/user123/timestamp-file.pdf')
+        conn: Connection to use (default: check one out of the pool)
 
     Returns:
         Dictionary with document data or None if not found
@@ -29,30 +38,84 @@ def get_document_by_s3_key(s3_key: str) -> Optional[Dict[str, Any]]:
         DatabaseError: If query fails
     """
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id, user_id, filename, file_type, file_size, status
-                FROM documents
-                WHERE s3_key = %s
-            """, (s3_key,))
-
-            row = cur.fetchone()
-            if row:
-                return {
-                    'id': row[0],
-                    'user_id': row[1],
-                    'filename': row[2],
-                    'file_type': row[3],
-                    'file_size': row[4],
-                    'status': row[5]
+        with db_connection(conn) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, user_id, filename, file_type, file_size, status
+                    FROM documents
+                    WHERE s3_key = %s
+                """, (s3_key,))
+
+                row = cur.fetchone()
+                if row:
+                    return {
+                        'id': str(row[0]),
+                        'user_id': row[1],
+                        'filename': row[2],
+                        'file_type': row[3],
+                        'file_size': row[4],
+                        'status': row[5]
+                    }
+
+                logger.warning(f"Document not found for s3_key: {s3_key}")
+                return None
+
+    except psycopg.Error as e:
+        error_msg = f"Failed to query document by s3_key: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise DatabaseError(error_msg)
+
+
+def get_documents_by_s3_keys(
+    s3_keys: List[str],
+    conn: Optional[Connection] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Query documents for a batch of S3 keys in a single round trip.
+
+    Args:
+        s3_keys: S3 object keys
+        conn: Connection to use (default: check one out of the pool)
+
+    Returns:
+        Dictionary mapping each found s3_key to its document data
+        (keys with no matching document are omitted)
+
+    Raises:
+        DatabaseError: If query fails
+    """
+    if not s3_keys:
+        return {}
+
+    try:
+        with db_connection(conn) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, user_id, filename, file_type, file_size, status, s3_key
+                    FROM documents
+                    WHERE s3_key = ANY(%s)
+                """, (list(s3_keys),))
+
+                documents = {
+                    row[6]: {
+                        'id': str(row[0]),
+                        'user_id': row[1],
+                        'filename': row[2],
+                        'file_type': row[3],
+                        'file_size': row[4],
+                        'status': row[5]
+                    }
+                    for row in cur.fetchall()
                 }
 
-            logger.warning(f"Document not found for s3_key: {s3_key}")
-            return None
+        missing = [s3_key for s3_key in s3_keys if s3_key not in documents]
+        if missing:
+            logger.warning(f"Documents not found for s3_keys: {', '.join(missing)}")
 
-    except psycopg2.Error as e:
-        error_msg = f"Failed to query document by s3_key: {str(e)}"
+        return documents
+
+    except psycopg.Error as e:
+        error_msg = f"Failed to query documents by s3_keys: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise DatabaseError(error_msg)
 
@@ -62,7 +125,8 @@ def update_document_status(
     status: str,
     error_message: Optional[str] = None,
     page_count: Optional[int] = None,
-    chunk_count: Optional[int] = None
+    chunk_count: Optional[int] = None,
+    conn: Optional[Connection] = None
 ) -> bool:
     """
     Update document status and metadata.
@@ -73,6 +137,8 @@ def update_document_status(
         error_message: Error message if status is 'failed'
         page_count: Number of pages processed
         chunk_count: Number of chunks created
+        conn: Connection to use (default: check one out of the pool); the
+              update joins its transaction if one is open
 
     Returns:
         True if update successful
@@ -81,58 +147,97 @@ def update_document_status(
         DatabaseError: If update fails
     """
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("""
-                UPDATE documents
-                SET status = %s,
-                    error_message = %s,
-                    page_count = %s,
-                    chunk_count = %s,
-                    updated_at = NOW()
-                WHERE id = %s
-            """, (status, error_message, page_count, chunk_count, document_id))
-
-            rows_updated = cur.rowcount
-
-        conn.commit()
-
-        if rows_updated > 0:
-            logger.info(
-                f"Updated document status to '{status}'",
-                extra={
-                    'document_id': document_id,
-                    'status': status,
-                    'page_count': page_count,
-                    'chunk_count': chunk_count
-                }
-            )
-            return True
-        else:
-            logger.warning(f"No document found with id: {document_id}")
-            return False
-
-    except psycopg2.Error as e:
-        conn.rollback()
+        with db_connection(conn) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE documents
+                    SET status = %s,
+                        error_message = %s,
+                        page_count = %s,
+                        chunk_count = %s,
+                        updated_at = NOW()
+                    WHERE id = %s
+                """, (status, error_message, page_count, chunk_count, document_id))
+
+                rows_updated = cur.rowcount
+
+            if rows_updated > 0:
+                logger.info(
+                    f"Updated document status to '{status}'",
+                    extra={
+                        'document_id': document_id,
+                        'status': status,
+                        'page_count': page_count,
+                        'chunk_count': chunk_count
+                    }
+                )
+                return True
+            else:
+                logger.warning(f"No document found with id: {document_id}")
+                return False
+
+    except psycopg.Error as e:
         error_msg = f"Failed to update document status: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise DatabaseError(error_msg)
 
 
-def bulk_insert_chunks(document_id: str, chunks: List[Dict[str, Any]]) -> int:
+@lru_cache(maxsize=4)
+def _vector_format(dimensions: int) -> str:
+    """
+    Build a %-format string that renders a whole vector in pgvector text form.
+
+    Args:
+        dimensions: Number of vector components
+
+    Returns:
+        Format string such as '[%.9g,%.9g,...]'
+    """
+    return '[' + ','.join(['%.9g'] * dimensions) + ']'
+
+
+def _vector_literal(embedding: Union[List[float], np.ndarray]) -> str:
+    """
+    Render an embedding as a pgvector text literal.
+
+    pgvector stores float4 components, so 9 significant digits round-trip
+    every value exactly. Formatting the whole vector with one cached
+    %-format call avoids a Python-level str() per component.
+
+    Args:
+        embedding: Vector embedding (list of floats or float32 array)
+
+    Returns:
+        Vector literal such as '[0.1,0.2,...]'
+    """
+    if isinstance(embedding, np.ndarray):
+        embedding = embedding.tolist()
+    return _vector_format(len(embedding)) % tuple(embedding)
+
+
+def bulk_insert_chunks(
+    document_id: str,
+    rows: List[tuple],
+    conn: Optional[Connection] = None
+) -> int:
     """
     Bulk insert document chunks with embeddings.
 
-    Uses execute_batch for high performance bulk insertion.
+    Streams all rows to PostgreSQL with a single binary COPY FROM STDIN, so
+    the server reads each embedding as raw float4 values instead of parsing
+    a text literal per component. If COPY fails the work is rolled back to
+    a savepoint and the rows are sent with executemany() in pipeline mode
+    instead, so every INSERT goes out back-to-back without waiting for a
+    round trip per row. The INSERT is prepared automatically once psycopg
+    has seen it often enough.
 
     Args:
         document_id: Document UUID
-        chunks: List of chunk dictionaries with keys:
-                - content: Text content
-                - embedding: Vector embedding (list of floats)
-                - chunk_index: Index of chunk in document
-                - page_number: Page number
-                - metadata: Additional metadata (dict)
+        rows: Row tuples of (content, embedding, chunk_index, page_number, metadata)
+              where embedding is a list of floats or float32 array and
+              metadata a dict
+        conn: Connection inside the caller's transaction (default: insert
+              in a transaction of its own on a pooled connection)
 
     Returns:
         Number of chunks inserted
@@ -140,56 +245,67 @@ def bulk_insert_chunks(document_id: str, chunks: List[Dict[str, Any]]) -> int:
     Raises:
         DatabaseError: If insertion fails
     """
-    if not chunks:
+    if not rows:
         logger.warning("No chunks to insert")
         return 0
 
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            # Prepare data tuples
-            data = []
-            for chunk in chunks:
-                # Convert embedding list to PostgreSQL array format
-                embedding = chunk.get('embedding')
-                if embedding:
-                    embedding_str = '[' + ','.join(map(str, embedding)) + ']'
-                else:
-                    embedding_str = None
-
-                data.append((
-                    document_id,
-                    chunk['content'],
-                    embedding_str,
-                    chunk['chunk_index'],
-                    chunk['page_number'],
-                    Json(chunk.get('metadata', {}))
-                ))
-
-            # Bulk insert using execute_batch for performance
-            execute_batch(cur, """
-                INSERT INTO document_chunks
-                (document_id, content, embedding, chunk_index, page_number, metadata)
-                VALUES (%s, %s, %s::vector, %s, %s, %s)
-            """, data, page_size=100)
-
-        conn.commit()
-
-        logger.info(
-            f"Inserted {len(chunks)} chunks",
-            extra={'document_id': document_id, 'chunk_count': len(chunks)}
-        )
-
-        return len(chunks)
-
-    except psycopg2.Error as e:
-        conn.rollback()
+        with transaction(conn) as conn:
+            with conn.cursor() as cur:
+                try:
+                    # Nested transaction() blocks run under a savepoint
+                    with conn.transaction():
+                        with cur.copy("""
+                            COPY document_chunks
+                            (document_id, content, embedding, chunk_index, page_number, metadata)
+                            FROM STDIN WITH (FORMAT BINARY)
+                        """) as copy:
+                            # Binary COPY needs the column types up front; the
+                            # vector type is registered on every pooled connection
+                            copy.set_types(['uuid', 'text', 'vector', 'int4', 'int4', 'jsonb'])
+
+                            doc_uuid = uuid.UUID(str(document_id))
+                            for content, embedding, chunk_index, page_number, metadata in rows:
+                                copy.write_row((
+                                    doc_uuid, content, embedding, chunk_index,
+                                    page_number, Jsonb(metadata)
+                                ))
+                except psycopg.Error as copy_error:
+                    logger.warning(
+                        f"COPY failed, falling back to INSERT: {str(copy_error)}",
+                        extra={'document_id': document_id}
+                    )
+
+                    # Convert embeddings to pgvector text format for the INSERT path
+                    data = [
+                        (document_id, content,
+                         _vector_literal(embedding) if embedding is not None and len(embedding) else None,
+                         chunk_index, page_number, Jsonb(metadata))
+                        for content, embedding, chunk_index, page_number, metadata in rows
+                    ]
+
+                    # COPY cannot run in pipeline mode, so only the fallback is pipelined
+                    with conn.pipeline():
+                        cur.executemany("""
+                            INSERT INTO document_chunks
+                            (document_id, content, embedding, chunk_index, page_number, metadata)
+                            VALUES (%s, %s, %s::vector, %s, %s, %s)
+                        """, data)
+
+            logger.info(
+                f"Inserted {len(rows)} chunks",
+                extra={'document_id': document_id, 'chunk_count': len(rows)}
+            )
+
+            return len(rows)
+
+    except psycopg.Error as e:
         error_msg = f"Failed to insert chunks: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise DatabaseError(error_msg)
 
 
-def delete_document_chunks(document_id: str) -> int:
+def delete_document_chunks(document_id: str, conn: Optional[Connection] = None) -> int:
     """
     Delete all chunks for a document.
 
@@ -197,6 +313,7 @@ def delete_document_chunks(document_id: str) -> int:
 
     Args:
         document_id: Document UUID
+        conn: Connection to use (default: check one out of the pool)
 
     Returns:
         Number of chunks deleted
@@ -205,37 +322,35 @@ def delete_document_chunks(document_id: str) -> int:
         DatabaseError: If deletion fails
     """
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("""
-                DELETE FROM document_chunks
-                WHERE document_id = %s
-            """, (document_id,))
+        with db_connection(conn) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM document_chunks
+                    WHERE document_id = %s
+                """, (document_id,))
 
-            rows_deleted = cur.rowcount
+                rows_deleted = cur.rowcount
 
-        conn.commit()
-
-        logger.info(
-            f"Deleted {rows_deleted} chunks",
-            extra={'document_id': document_id}
-        )
+            logger.info(
+                f"Deleted {rows_deleted} chunks",
+                extra={'document_id': document_id}
+            )
 
-        return rows_deleted
+            return rows_deleted
 
-    except psycopg2.Error as e:
-        conn.rollback()
+    except psycopg.Error as e:
         error_msg = f"Failed to delete chunks: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise DatabaseError(error_msg)
 
 
-def get_document_chunk_count(document_id: str) -> int:
+def get_document_chunk_count(document_id: str, conn: Optional[Connection] = None) -> int:
     """
     Get count of chunks for a document.
 
     Args:
         document_id: Document UUID
+        conn: Connection to use (default: check one out of the pool)
 
     Returns:
         Number of chunks
@@ -244,18 +359,18 @@ def get_document_chunk_count(document_id: str) -> int:
         DatabaseError: If query fails
     """
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT COUNT(*)
-                FROM document_chunks
-                WHERE document_id = %s
-            """, (document_id,))
-
-            row = cur.fetchone()
-            return row[0] if row else 0
-
-    except psycopg2.Error as e:
+        with db_connection(conn) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT COUNT(*)
+                    FROM document_chunks
+                    WHERE document_id = %s
+                """, (document_id,))
+
+                row = cur.fetchone()
+                return row[0] if row else 0
+
+    except psycopg.Error as e:
         error_msg = f"Failed to get chunk count: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise DatabaseError(error_msg)
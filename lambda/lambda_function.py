@@ -13,9 +13,14 @@ Triggered by SQS messages from S3 events.
 import json
 import os
 import tempfile
-from typing import List, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
 
 import boto3
+import numpy as np
+import openai
+from boto3.s3.transfer import TransferConfig
 from langchain_community.document_loaders import (
     PyPDFLoader,
     Docx2txtLoader,
@@ -27,18 +32,49 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from config import Config
 from database.operations import (
-    get_document_by_s3_key,
+    get_documents_by_s3_keys,
     update_document_status,
     bulk_insert_chunks
 )
-from utils.logger import get_logger
-from utils.exceptions import ParsingError, DatabaseError
+from database.client import transaction
+from utils.logger import get_logger, bind, flush_logs
+from utils.exceptions import ParsingError, DatabaseError, EmbeddingError, ValidationError
 
 logger = get_logger(__name__)
 
 # Initialize AWS S3 client
 s3_client = boto3.client('s3', region_name=Config.AWS_REGION)
 
+# Download multi-MB objects as parallel ranged GETs
+s3_transfer_config = TransferConfig(
+    multipart_threshold=Config.S3_TRANSFER_CHUNK_SIZE,
+    multipart_chunksize=Config.S3_TRANSFER_CHUNK_SIZE,
+    max_concurrency=Config.S3_TRANSFER_MAX_CONCURRENCY,
+    use_threads=True
+)
+
+# Initialize LangChain text splitter and embeddings model once per container
+text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+    encoding_name=Config.CHUNK_ENCODING,
+    chunk_size=Config.CHUNK_SIZE,
+    chunk_overlap=Config.CHUNK_OVERLAP,
+    separators=["\n\n", "\n", ". ", " ", ""]
+)
+
+embeddings_model = OpenAIEmbeddings(
+    openai_api_key=Config.OPENAI_API_KEY,
+    model=Config.OPENAI_EMBEDDING_MODEL
+)
+
+
+# LangChain loader class for each supported MIME type
+LOADERS = {
+    'application/pdf': PyPDFLoader,
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': Docx2txtLoader,
+    'text/plain': TextLoader,
+    'text/markdown': UnstructuredMarkdownLoader,
+}
+
 
 def get_loader_for_file_type(file_path: str, file_type: str):
     """
@@ -54,14 +90,7 @@ def get_loader_for_file_type(file_path: str, file_type: str):
     Raises:
         ParsingError: If file type is not supported
     """
-    loaders = {
-        'application/pdf': PyPDFLoader,
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document': Docx2txtLoader,
-        'text/plain': TextLoader,
-        'text/markdown': UnstructuredMarkdownLoader,
-    }
-
-    loader_class = loaders.get(file_type)
+    loader_class = LOADERS.get(file_type)
     if not loader_class:
         raise ParsingError(f"Unsupported file type: {file_type}")
 
@@ -96,11 +125,118 @@ def download_from_s3(bucket: str, key: str) -> str:
     temp_file.close()
 
     logger.info(f"Downloading s3://{bucket}/{key} to {temp_path}")
-    s3_client.download_file(bucket, key, temp_path)
+    s3_client.download_file(bucket, key, temp_path, Config=s3_transfer_config)
 
     return temp_path
 
 
+def embed_batch(texts: List[str]) -> np.ndarray:
+    """
+    Embed one batch of texts, retrying with exponential backoff on rate limits.
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        float32 array with one embedding vector per text, in the same order
+
+    Raises:
+        EmbeddingError: If the batch is still rate limited after all retries
+    """
+    for attempt in range(Config.EMBEDDING_MAX_RETRIES):
+        try:
+            # float32 matches pgvector's storage and is a quarter the size
+            # of a list of Python floats
+            return np.asarray(embeddings_model.embed_documents(texts), dtype=np.float32)
+        except openai.RateLimitError as e:
+            if attempt == Config.EMBEDDING_MAX_RETRIES - 1:
+                raise EmbeddingError(f"Embedding rate limit retries exhausted: {str(e)}")
+
+            delay = 2 ** attempt
+            logger.warning(f"Embedding request rate limited, retrying in {delay}s")
+            time.sleep(delay)
+
+
+def build_chunk_rows(
+    chunks: List[Any],
+    embeddings: List[np.ndarray],
+    page_numbers: List[int]
+) -> List[tuple]:
+    """
+    Build database row tuples for a document's LangChain chunks.
+
+    Args:
+        chunks: LangChain document chunks
+        embeddings: Embedding vectors for the chunks, in the same order
+        page_numbers: Page numbers for the chunks, in the same order (None
+                      when unknown, stored as page 1)
+
+    Returns:
+        Row tuples accepted by bulk_insert_chunks
+    """
+    total_chunks = len(chunks)
+    return [
+        (
+            chunk.page_content,
+            embedding,
+            i,
+            1 if page_number is None else page_number,
+            {'source': chunk.metadata.get('source', ''), 'total_chunks': total_chunks, **chunk.metadata}
+        )
+        for i, (chunk, embedding, page_number)
+        in enumerate(zip(chunks, embeddings, page_numbers))
+    ]
+
+
+def embed_chunks(
+    chunks: List[Any],
+    page_numbers: List[int]
+) -> List[tuple]:
+    """
+    Embed chunks in concurrent batches and build their database rows.
+
+    No database connection is held here: embedding requests (and their
+    rate limit backoff) can take a long time, so rows are only inserted
+    once every chunk is embedded.
+
+    Args:
+        chunks: LangChain document chunks
+        page_numbers: Page number of each chunk
+
+    Returns:
+        Row tuples accepted by bulk_insert_chunks
+    """
+    batch_size = Config.EMBEDDING_BATCH_SIZE
+
+    # Embed each distinct text once (repeated headers/footers are common);
+    # slots maps every chunk to the index of its text in unique_texts
+    unique_index: Dict[str, int] = {}
+    slots = [unique_index.setdefault(chunk.page_content, len(unique_index)) for chunk in chunks]
+    unique_texts = list(unique_index)
+    unique_count = len(unique_texts)
+    batches = [unique_texts[i:i + batch_size] for i in range(0, unique_count, batch_size)]
+    del unique_index, unique_texts
+
+    if unique_count < len(chunks):
+        logger.info(f"Embedding {unique_count} unique texts for {len(chunks)} chunks")
+
+    vectors: Optional[np.ndarray] = None
+    embedded_count = 0
+
+    with ThreadPoolExecutor(max_workers=Config.EMBEDDING_MAX_WORKERS) as embed_executor:
+        embedded = embed_executor.map(embed_batch, batches)
+        for embeddings in embedded:
+            # Collect all vectors in one float32 array sized on the first batch
+            if vectors is None:
+                vectors = np.empty((unique_count, embeddings.shape[1]), dtype=np.float32)
+            vectors[embedded_count:embedded_count + len(embeddings)] = embeddings
+            embedded_count += len(embeddings)
+            del embeddings
+
+    # Rows hold views into vectors rather than copies
+    return build_chunk_rows(chunks, [vectors[slot] for slot in slots], page_numbers)
+
+
 def process_document(
     document_id: str,
     s3_key: str,
@@ -123,93 +259,75 @@ def process_document(
     """
     temp_file_path = None
 
+    # Every record about this document carries its id without a per-call extra dict
+    doc_logger = bind(logger, document_id=document_id)
+
     try:
-        # Update status to processing
-        update_document_status(document_id, 'processing')
+        # Mark the document as processing while the file downloads
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            status_future = executor.submit(update_document_status, document_id, 'processing')
+            download_future = executor.submit(download_from_s3, Config.S3_BUCKET_NAME, s3_key)
 
-        # Download file from S3
-        temp_file_path = download_from_s3(Config.S3_BUCKET_NAME, s3_key)
-        logger.info(f"Downloaded document to {temp_file_path}")
+            temp_file_path = download_future.result()
+            status_future.result()
+
+        doc_logger.info(f"Downloaded document to {temp_file_path}")
 
         # Load document using LangChain loader
         loader = get_loader_for_file_type(temp_file_path, file_type)
-        documents = loader.load()
+        try:
+            documents = loader.load()
+        except Exception as e:
+            # A corrupted or malformed file fails the same way on every retry
+            raise ParsingError(f"Failed to load document: {str(e)}")
 
         if not documents:
             raise ParsingError("No content extracted from document")
 
-        logger.info(f"Loaded {len(documents)} pages/sections from document")
+        doc_logger.info(f"Loaded {len(documents)} pages/sections from document")
 
         # Split documents into chunks using LangChain text splitter
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=Config.CHUNK_SIZE,
-            chunk_overlap=Config.CHUNK_OVERLAP,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""]
-        )
-
-        chunks = text_splitter.split_documents(documents)
-        logger.info(f"Split into {len(chunks)} chunks")
+        try:
+            chunks = text_splitter.split_documents(documents)
+        except Exception as e:
+            raise ParsingError(f"Failed to split document: {str(e)}")
+        doc_logger.info(f"Split into {len(chunks)} chunks")
 
         if not chunks:
             raise ParsingError("No chunks created from document")
 
-        # Generate embeddings using OpenAI
-        embeddings_model = OpenAIEmbeddings(
-            openai_api_key=Config.OPENAI_API_KEY,
-            model=Config.OPENAI_EMBEDDING_MODEL
-        )
-
-        # Extract texts for embedding
-        texts = [chunk.page_content for chunk in chunks]
-
-        # Generate embeddings in batches
-        logger.info(f"Generating embeddings for {len(texts)} chunks")
-        embeddings = embeddings_model.embed_documents(texts)
-
-        # Prepare chunks for database insertion
-        db_chunks = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            # Extract page number from metadata if available
-            page_number = chunk.metadata.get('page', chunk.metadata.get('page_number', 1))
-
-            db_chunks.append({
-                'content': chunk.page_content,
-                'embedding': embedding,
-                'chunk_index': i,
-                'page_number': page_number,
-                'metadata': {
-                    'source': chunk.metadata.get('source', ''),
-                    'total_chunks': len(chunks),
-                    **chunk.metadata
-                }
-            })
-
-        # Store chunks in database
-        logger.info(f"Storing {len(db_chunks)} chunks in database")
-        chunk_count = bulk_insert_chunks(document_id, db_chunks)
-
-        # Calculate page count from documents
-        page_numbers = set()
-        for chunk in chunks:
-            page_num = chunk.metadata.get('page', chunk.metadata.get('page_number'))
-            if page_num:
-                page_numbers.add(page_num)
-
-        page_count = max(page_numbers) if page_numbers else len(documents)
-
-        # Update document status to ready
-        update_document_status(
-            document_id,
-            'ready',
-            page_count=page_count,
-            chunk_count=chunk_count
-        )
+        # Extract page numbers from metadata once; page count is the highest
+        page_numbers = [
+            chunk.metadata.get('page', chunk.metadata.get('page_number')) for chunk in chunks
+        ]
+        page_count = max(filter(None, page_numbers), default=0) or len(documents)
+
+        # Chunks carry their own text and metadata, so the parsed pages can go
+        del documents
+
+        doc_logger.info(f"Generating embeddings for {len(chunks)} chunks")
+        rows = embed_chunks(chunks, page_numbers)
+        del chunks, page_numbers
+
+        # Store chunks and mark the document ready in one transaction; if
+        # anything fails, the inserts are rolled back. The transaction only
+        # starts once all embeddings are ready, so no connection sits idle in
+        # a transaction while OpenAI requests are in flight.
+        with transaction() as conn:
+            chunk_count = bulk_insert_chunks(document_id, rows, conn=conn)
+            del rows
+
+            update_document_status(
+                document_id,
+                'ready',
+                page_count=page_count,
+                chunk_count=chunk_count,
+                conn=conn
+            )
 
-        logger.info(
+        doc_logger.info(
             f"Successfully processed document",
             extra={
-                'document_id': document_id,
                 'page_count': page_count,
                 'chunk_count': chunk_count
             }
@@ -224,17 +342,16 @@ def process_document(
 
     except Exception as e:
         error_msg = str(e)
-        logger.error(
+        doc_logger.error(
             f"Failed to process document: {error_msg}",
-            exc_info=True,
-            extra={'document_id': document_id}
+            exc_info=True
         )
 
         # Update document status to failed
         try:
             update_document_status(document_id, 'failed', error_message=error_msg)
         except Exception as db_error:
-            logger.error(f"Failed to update error status: {str(db_error)}")
+            doc_logger.error(f"Failed to update error status: {str(db_error)}")
 
         raise
 
@@ -243,9 +360,40 @@ def process_document(
         if temp_file_path and os.path.exists(temp_file_path):
             try:
                 os.unlink(temp_file_path)
-                logger.debug(f"Cleaned up temp file: {temp_file_path}")
+                doc_logger.debug(f"Cleaned up temp file: {temp_file_path}")
             except Exception as e:
-                logger.warning(f"Failed to cleanup temp file: {str(e)}")
+                doc_logger.warning(f"Failed to cleanup temp file: {str(e)}")
+
+
+def process_record(
+    s3_bucket: str,
+    s3_key: str,
+    doc_data: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Process the document referenced by a single SQS record.
+
+    Args:
+        s3_bucket: S3 bucket name from the event
+        s3_key: S3 object key from the event
+        doc_data: Document metadata from the database (None if not found)
+
+    Returns:
+        Dictionary with processing results
+
+    Raises:
+        ValidationError: If no document exists for the S3 key
+    """
+    logger.info(f"Processing S3 object: s3://{s3_bucket}/{s3_key}")
+
+    if not doc_data:
+        raise ValidationError(f"Document not found in database for s3_key: {s3_key}")
+
+    return process_document(
+        document_id=doc_data['id'],
+        s3_key=s3_key,
+        file_type=doc_data['file_type']
+    )
 
 
 def lambda_handler(event, context):
@@ -259,89 +407,121 @@ def lambda_handler(event, context):
         context: Lambda context
 
     Returns:
-        Success/failure response
+        Success/failure response, including SQS batchItemFailures
     """
-    logger.info("Lambda function invoked", extra={'event': event})
-
-    # Validate configuration
     try:
-        Config.validate_config()
-    except ValueError as e:
-        logger.error(f"Configuration error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': f'Configuration error: {str(e)}'})
-        }
+        logger.info("Lambda function invoked", extra={'event': event})
+
+        results = []
+
+        # Only failures worth retrying go back to the queue; malformed messages
+        # and documents that can never be processed are logged and acknowledged
+        failed_message_ids = []
+        dropped_count = 0
 
-    results = []
-    failed_count = 0
+        # Extract S3 object details from every SQS record
+        pending = []
+        for record in event.get('Records', []):
+            try:
+                # Parse S3 event from SQS message
+                message_body = json.loads(record['body'])
+
+                # Handle S3 test event
+                if message_body.get('Event') == 's3:TestEvent':
+                    logger.info("Received S3 test event, skipping")
+                    continue
+
+                # Extract S3 event details
+                s3_event = message_body.get('Records', [{}])[0]
+                s3_bucket = s3_event.get('s3', {}).get('bucket', {}).get('name')
+                s3_key = s3_event.get('s3', {}).get('object', {}).get('key')
 
-    # Process each SQS record
-    for record in event.get('Records', []):
+                if not s3_bucket or not s3_key:
+                    logger.error("Invalid S3 event: missing bucket or key")
+                    dropped_count += 1
+                    continue
+
+                pending.append((record, s3_bucket, s3_key))
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to parse record: {str(e)}",
+                    exc_info=True,
+                    extra={'record': record}
+                )
+                dropped_count += 1
+
+        # Get document metadata for the whole batch in one query
         try:
-            # Parse S3 event from SQS message
-            message_body = json.loads(record['body'])
-
-            # Handle S3 test event
-            if message_body.get('Event') == 's3:TestEvent':
-                logger.info("Received S3 test event, skipping")
-                continue
-
-            # Extract S3 event details
-            s3_event = message_body.get('Records', [{}])[0]
-            s3_bucket = s3_event.get('s3', {}).get('bucket', {}).get('name')
-            s3_key = s3_event.get('s3', {}).get('object', {}).get('key')
-
-            if not s3_bucket or not s3_key:
-                logger.error("Invalid S3 event: missing bucket or key")
-                failed_count += 1
-                continue
-
-            logger.info(f"Processing S3 object: s3://{s3_bucket}/{s3_key}")
-
-            # Get document metadata from database
-            doc_data = get_document_by_s3_key(s3_key)
-
-            if not doc_data:
-                logger.error(f"Document not found in database for s3_key: {s3_key}")
-                failed_count += 1
-                continue
-
-            # Process the document
-            result = process_document(
-                document_id=doc_data['id'],
-                s3_key=s3_key,
-                file_type=doc_data['file_type']
+            documents = get_documents_by_s3_keys([s3_key for _, _, s3_key in pending])
+        except DatabaseError as e:
+            logger.error(f"Failed to fetch documents for batch: {str(e)}")
+            failed_message_ids.extend(record.get('messageId') for record, _, _ in pending)
+            pending = []
+
+        # Process documents concurrently; each one is dominated by network I/O
+        if pending:
+            # Each document holds a pooled connection while it writes, so never
+            # run more documents at once than the pool has connections
+            max_workers = min(
+                Config.MAX_CONCURRENT_DOCUMENTS,
+                Config.DB_POOL_MAX_CONNECTIONS,
+                len(pending)
             )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(process_record, s3_bucket, s3_key, documents.get(s3_key)): record
+                    for record, s3_bucket, s3_key in pending
+                }
 
-            results.append(result)
+                for future in as_completed(futures):
+                    record = futures[future]
+                    try:
+                        results.append(future.result())
+                    except (ValidationError, ParsingError) as e:
+                        # Retrying cannot fix a missing document or an unreadable file
+                        logger.error(
+                            f"Dropping unprocessable record: {str(e)}",
+                            extra={'record': record}
+                        )
+                        dropped_count += 1
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to process record: {str(e)}",
+                            exc_info=True,
+                            extra={'record': record}
+                        )
+                        failed_message_ids.append(record.get('messageId'))
+
+        # Return summary
+        success_count = len(results)
+        failed_count = len(failed_message_ids) + dropped_count
+        total_count = len(event.get('Records', []))
 
-        except Exception as e:
-            logger.error(
-                f"Failed to process record: {str(e)}",
-                exc_info=True,
-                extra={'record': record}
-            )
-            failed_count += 1
-
-    # Return summary
-    success_count = len(results)
-    total_count = len(event.get('Records', []))
-
-    logger.info(
-        f"Batch processing complete",
-        extra={
-            'total': total_count,
-            'success': success_count,
-            'failed': failed_count
+        logger.info(
+            f"Batch processing complete",
+            extra={
+                'total': total_count,
+                'success': success_count,
+                'failed': failed_count
+            }
+        )
+
+        return {
+            'statusCode': 200 if failed_count == 0 else 207,
+            'body': json.dumps({
+                'message': f'Processed {success_count}/{total_count} documents',
+                'results': results,
+                'failed_count': failed_count
+            }),
+            # Partial batch response: only retryable failures return to the
+            # queue (requires ReportBatchItemFailures on the SQS event source
+            # mapping); dropped records count as failed but are acknowledged
+            'batchItemFailures': [
+                {'itemIdentifier': message_id} for message_id in failed_message_ids
+            ]
         }
-    )
 
-    return {
-        'statusCode': 200 if failed_count == 0 else 207,
-        'body': json.dumps({
-            'message': f'Processed {success_count}/{total_count} documents',
-            'results': results,
-            'failed_count': failed_count
-        })
-    }
+    finally:
+        # Queued log records must reach CloudWatch before the container freezes
+        flush_logs()
@@ -3,11 +3,174 @@ Structured logging module for DocTalk Lambda document processor.
 
 Provides JSON-formatted logging optimized for CloudWatch Logs.
 """
+import atexit
 import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
 import traceback
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, MutableMapping, Optional, Sequence, Tuple, Union
+
+# msgspec and orjson are much faster than stdlib json; use whichever is
+# packaged, preferring msgspec, and fall back to json otherwise
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Formatted timestamp prefix for the most recent second, as (epoch_second, prefix);
+# kept as one tuple so concurrent threads never see a mismatched pair
+_ts_cache = (-1, b'')
+
+
+def _format_timestamp(created: float, msecs: float) -> bytes:
+    """
+    Format a record creation time as an ISO 8601 UTC timestamp.
+
+    The 'YYYY-MM-DDTHH:MM:SS' part is cached per second, so records logged
+    within the same second only pay for the millisecond suffix.
+
+    Args:
+        created: Record creation time in epoch seconds
+        msecs: Millisecond part of the creation time
+
+    Returns:
+        ASCII timestamp such as b'2024-01-01T12:00:00.123Z'
+    """
+    global _ts_cache
+
+    sec = int(created)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        tm = time.gmtime(sec)
+        prefix = b'%04d-%02d-%02dT%02d:%02d:%02d' % (
+            tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec
+        )
+        _ts_cache = (sec, prefix)
+
+    return b'%s.%03dZ' % (prefix, msecs)
+
+
+def _format_datetime(value: datetime) -> str:
+    """
+    Render a datetime as ISO 8601, with UTC written as a trailing 'Z'.
+
+    Args:
+        value: Datetime to render (naive datetimes are treated as UTC)
+
+    Returns:
+        ISO 8601 string such as '2024-01-01T12:00:00Z'
+    """
+    offset = value.utcoffset()
+    if offset is None:
+        return value.isoformat() + 'Z'
+    if not offset:
+        return value.replace(tzinfo=None).isoformat() + 'Z'
+    return value.isoformat()
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Serialize values the JSON encoder does not support natively.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        JSON-compatible representation
+    """
+    if isinstance(value, datetime):
+        return _format_datetime(value)
+    return str(value)
+
+
+# Reusable msgspec encoder; values it can't encode go through _json_default
+_msgspec_encoder = msgspec.json.Encoder(enc_hook=_json_default) if msgspec is not None else None
+
+# Errors raised by the fast encoders for values the json module still handles
+# (orjson.JSONEncodeError is a TypeError; msgspec raises UnicodeEncodeError for
+# invalid strings and EncodeError otherwise)
+_FAST_ENCODE_ERRORS: Tuple[type, ...] = (TypeError, ValueError) + (
+    (msgspec.EncodeError,) if msgspec is not None else ()
+)
+
+
+def _encode(value: Any) -> bytes:
+    """
+    Serialize a single value to JSON.
+
+    Datetimes are rendered up front so every encoder writes the same
+    format; msgspec would otherwise write naive values without a 'Z'.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        UTF-8 JSON for the value
+    """
+    if isinstance(value, datetime):
+        value = _format_datetime(value)
+
+    try:
+        if _msgspec_encoder is not None:
+            return _msgspec_encoder.encode(value)
+
+        if orjson is not None:
+            return orjson.dumps(
+                value,
+                default=_json_default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+            )
+    except _FAST_ENCODE_ERRORS:
+        # The fast encoders reject strings that aren't valid UTF-8 (e.g. lone
+        # surrogates from a failed decode); json escapes them instead
+        pass
+
+    return json.dumps(value, default=_json_default).encode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _encode_name(name: str) -> bytes:
+    """
+    Serialize a level or logger name to JSON, cached since there are few.
+
+    Args:
+        name: Level or logger name
+
+    Returns:
+        UTF-8 JSON string literal
+    """
+    return _encode(name)
+
+
+# Record attributes passed via `extra` that are copied into the JSON output,
+# as (record attribute, pre-encoded ',"json_key":' fragment)
+_EXTRA_FIELDS = tuple(
+    (attr, b',' + _encode(key) + b':')
+    for attr, key in (
+        ('document_id', 'document_id'),
+        ('s3_key', 's3_key'),
+        ('file_type', 'file_type'),
+        ('duration', 'duration_ms'),
+        ('chunk_count', 'chunk_count'),
+        ('page_count', 'page_count'),
+        ('stage', 'stage'),
+    )
+)
 
 
 class JSONFormatter(logging.Formatter):
@@ -15,8 +178,61 @@ class JSONFormatter(logging.Formatter):
     Custom formatter that outputs logs as JSON for better CloudWatch parsing.
 
     JSON format allows for easier searching, filtering, and analysis in CloudWatch Logs.
+    An instance reuses internal buffers and must only be used by one thread
+    at a time; the shared pipeline formatter is only called by the stream
+    handler, from the single listener thread.
     """
 
+    # Most recent encoded messages kept by each formatter
+    MESSAGE_CACHE_SIZE = 128
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+
+        # Encoded JSON for recently logged messages, oldest first; keyed by the
+        # message text since constant messages repeat for every document
+        self._message_cache: Dict[str, bytes] = {}
+
+        # Output buffer reused by every format() call
+        self._buf = bytearray()
+
+    def _encode_message(self, message: str) -> bytes:
+        """
+        Encode a log message, reusing the encoding of recent identical messages.
+
+        Args:
+            message: Formatted log message
+
+        Returns:
+            UTF-8 JSON string literal
+        """
+        cache = self._message_cache
+        encoded = cache.get(message)
+        if encoded is None:
+            encoded = _encode(message)
+            if len(cache) >= self.MESSAGE_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is the oldest
+                del cache[next(iter(cache))]
+            cache[message] = encoded
+        return encoded
+
+    def _format_traceback(self, record: logging.LogRecord) -> str:
+        """
+        Render the traceback of a record's exception.
+
+        The text is cached on record.exc_text, as logging.Formatter does, so
+        a record handled more than once is only formatted once.
+
+        Args:
+            record: Log record with exc_info set
+
+        Returns:
+            Formatted traceback text
+        """
+        if not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        return record.exc_text
+
     def format(self, record: logging.LogRecord) -> str:
         """
         Format log record as JSON string.
@@ -27,53 +243,404 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON string with structured log data
         """
-        log_data: Dict[str, Any] = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
-            'level': record.levelname,
-            'logger': record.name,
-            'message': record.getMessage(),
-        }
+        buf = self._buf
+        buf.clear()
+        self.render_into_buffer(record, buf)
+        return buf.decode('utf-8')
 
-        # Add extra fields if present
-        if hasattr(record, 'document_id'):
-            log_data['document_id'] = record.document_id
+    def render_into_buffer(self, record: logging.LogRecord, buf: bytearray) -> None:
+        """
+        Append a log record to a buffer as UTF-8 encoded JSON.
 
-        if hasattr(record, 's3_key'):
-            log_data['s3_key'] = record.s3_key
+        Lets a handler render records straight into its own output buffer
+        and write that, with no intermediate bytes or str copy.
 
-        if hasattr(record, 'file_type'):
-            log_data['file_type'] = record.file_type
+        Args:
+            record: Log record to format
+            buf: Buffer the JSON object is appended to
+        """
+        # Record fields are read straight from the instance dict
+        record_dict = record.__dict__
+
+        # Most calls pass a preformatted message with no %-args; skip getMessage()
+        msg = record_dict['msg']
+        message = msg if not record_dict['args'] and type(msg) is str else record.getMessage()
+
+        # The output schema is fixed, so the JSON object is assembled from
+        # pre-encoded key fragments and only the values are serialized
+        buf += b'{"timestamp":"'
+        buf += _format_timestamp(record.created, record.msecs)
+        buf += b'","level":'
+        buf += _encode_name(record.levelname)
+        buf += b',"logger":'
+        buf += _encode_name(record.name)
+        buf += b',"message":'
+        buf += self._encode_message(message)
+
+        # Add extra fields if present (plain dict lookups; None values are skipped)
+        for attr, prefix in _EXTRA_FIELDS:
+            value = record_dict.get(attr)
+            if value is not None:
+                buf += prefix
+                buf += _encode(value)
 
-        if hasattr(record, 'duration'):
-            log_data['duration_ms'] = record.duration
+        # Add exception information if present
+        exc_info = record_dict.get('exc_info')
+        if exc_info:
+            buf += b',"exception":'
+            buf += _encode({
+                'type': exc_info[0].__name__ if exc_info[0] else None,
+                'message': str(exc_info[1]) if exc_info[1] else None,
+                'traceback': self._format_traceback(record)
+            })
 
-        if hasattr(record, 'chunk_count'):
-            log_data['chunk_count'] = record.chunk_count
+        # Add stack trace if present
+        stack_info = record_dict.get('stack_info')
+        if stack_info:
+            buf += b',"stack_info":'
+            buf += _encode(stack_info)
 
-        if hasattr(record, 'page_count'):
-            log_data['page_count'] = record.page_count
+        buf += b'}'
 
-        # Add exception information if present
-        if record.exc_info:
-            log_data['exception'] = {
-                'type': record.exc_info[0].__name__ if record.exc_info[0] else None,
-                'message': str(record.exc_info[1]) if record.exc_info[1] else None,
-                'traceback': self.formatException(record.exc_info)
-            }
 
-        # Add stack trace if present
-        if record.stack_info:
-            log_data['stack_info'] = record.stack_info
+class BytesStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that writes UTF-8 JSON straight to the stream's byte buffer.
+
+    JSONFormatter produces bytes already, so going through the text stream
+    would only decode and re-encode every record. Records handed over
+    together via emit_batch() go out in a single write().
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+
+        # Output buffer the formatter renders lines into, reused per batch
+        self._buf = bytearray()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write a record as one JSON line.
+
+        Args:
+            record: Log record to write
+        """
+        self.emit_batch((record,))
+
+    def emit_batch(self, records: Sequence[logging.LogRecord]) -> None:
+        """
+        Write records as JSON lines with one write() and one flush().
+
+        The caller must hold the handler's lock (see _BatchListener).
 
-        return json.dumps(log_data)
+        Args:
+            records: Log records to write, in order
+        """
+        stream = self.stream
+        buffer = getattr(stream, 'buffer', None)
+        if buffer is None or not isinstance(self.formatter, JSONFormatter):
+            # Text-only stream (e.g. StringIO) or a foreign formatter
+            for record in records:
+                super().emit(record)
+            return
+
+        # Render every line into the reused buffer; a record that fails to
+        # render is reported and left out without losing the others
+        buf = self._buf
+        buf.clear()
+        for record in records:
+            start = len(buf)
+            try:
+                self.formatter.render_into_buffer(record, buf)
+                buf += b'\n'
+            except RecursionError:
+                raise
+            except Exception:
+                del buf[start:]
+                self.handleError(record)
+
+        if not buf:
+            return
+
+        try:
+            # Flush pending text first so lines stay in order
+            stream.flush()
+
+            # Write the buffer without copying it
+            with memoryview(buf) as view:
+                buffer.write(view)
+            buffer.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(records[0])
+
+
+class _NullLock:
+    """Stand-in for a handler lock that never blocks."""
+
+    def acquire(self, *args: Any) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
+
+    def __enter__(self) -> bool:
+        return True
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+
+class NoLockStreamHandler(BytesStreamHandler):
+    """
+    BytesStreamHandler without per-record locking.
+
+    Only safe when writes are already serialized by the caller: here every
+    batch is written by the single listener thread.
+    """
+
+    def createLock(self) -> None:
+        self.lock = _NullLock()
+
+    def acquire(self) -> None:
+        pass
 
+    def release(self) -> None:
+        pass
 
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps exception info on enqueued records.
+
+    The stock prepare() formats the whole record with a plain Formatter and
+    drops exc_info, which would lose the structured exception fields. Only
+    the message is rendered here; JSON formatting is left to the
+    JSONFormatter on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Render the record's message on the calling thread.
+
+        %-args are merged now, like the stock prepare() does, so the message
+        reflects the arguments as they were when the call was made rather
+        than when the listener gets to it.
+
+        Args:
+            record: Log record to enqueue
+
+        Returns:
+            The same record, with msg rendered and args cleared
+        """
+        if record.args or type(record.msg) is not str:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+# Most records the listener writes with a single write() call
+LOG_BATCH_MAX_RECORDS = 256
+
+
+class _BatchListener:
+    """
+    Background thread that writes queued records to a handler in batches.
+
+    Like logging.handlers.QueueListener, but on each wake-up it takes
+    everything already queued (up to LOG_BATCH_MAX_RECORDS) and hands it to
+    the handler's emit_batch(), so a burst of records costs one write()
+    instead of one per record.
+    """
+
+    def __init__(self, record_queue: queue.Queue, handler: BytesStreamHandler):
+        """
+        Args:
+            record_queue: Queue the QueueHandler puts records on
+            handler: Handler that writes the records
+        """
+        self.queue = record_queue
+        self.handler = handler
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the listener thread."""
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write out every record queued so far and stop the listener thread."""
+        # None is the sentinel, as for QueueListener
+        self.queue.put_nowait(None)
+        self._thread.join()
+        self._thread = None
+
+    def _monitor(self) -> None:
+        """Write batches of queued records until the sentinel is seen."""
+        record_queue = self.queue
+        handler = self.handler
+
+        while True:
+            # Block for the first record, then take whatever else is waiting
+            batch = [record_queue.get()]
+            while len(batch) < LOG_BATCH_MAX_RECORDS:
+                try:
+                    batch.append(record_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [record for record in batch if record is not None and handler.filter(record)]
+            try:
+                if records:
+                    handler.acquire()
+                    try:
+                        handler.emit_batch(records)
+                    finally:
+                        handler.release()
+            finally:
+                # Mark records done only once written, so flush_logs() waits for them
+                for _ in batch:
+                    record_queue.task_done()
+
+            if None in batch:
+                return
+
+
+# The one formatter behind every logger
+_SHARED_FORMATTER = JSONFormatter()
+
+# Logging pipeline shared by every logger, created on first use:
+# logger -> queue -> listener thread -> stderr
+_queue: Optional[queue.Queue] = None
+_listener: Optional[_BatchListener] = None
+_handler: Optional[logging.Handler] = None
+_handler_lock = threading.Lock()
+
+
+def _get_handler() -> logging.Handler:
+    """
+    Get the shared queue handler, starting the listener thread on first use.
+
+    Callers only enqueue records; JSON formatting and writing happen on the
+    listener thread, so logging never blocks on a slow stderr.
+
+    Returns:
+        QueueHandler feeding the background listener
+    """
+    global _queue, _listener, _handler
+
+    with _handler_lock:
+        if _handler is None:
+            # In Lambda the stream handler is only called from the listener
+            # thread, so its own per-record lock is redundant
+            if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+                stream_handler = NoLockStreamHandler()
+            else:
+                stream_handler = BytesStreamHandler()
+            stream_handler.setFormatter(_SHARED_FORMATTER)
+
+            # queue.Queue (not SimpleQueue) so flush_logs() can join() it
+            _queue = queue.Queue()
+            _listener = _BatchListener(_queue, stream_handler)
+            _listener.start()
+
+            _handler = _RecordQueueHandler(_queue)
+
+        return _handler
+
+
+def flush_logs() -> None:
+    """
+    Write out all queued log records.
+
+    Call at the end of every Lambda invocation: the execution environment
+    may be frozen (or never resumed) once the handler returns.
+    """
+    # Nothing to wait for before the pipeline starts or after _shutdown()
+    # stopped the listener (join() would block forever without it)
+    if _listener is None:
+        return
+
+    # Wait for the listener to write every record off the queue
+    _queue.join()
+
+
+def _shutdown() -> None:
+    """Stop the listener thread after draining the queue, at interpreter exit."""
+    global _listener
+
+    with _handler_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(_shutdown)
+
+
+def _read_sample_rate() -> Tuple[float, Optional[str]]:
+    """
+    Read the log sample rate from the LOG_SAMPLE_RATE environment variable.
+
+    Every module imports this one, so a malformed value must not raise.
+
+    Returns:
+        Tuple of (rate clamped to 0.0 - 1.0, the raw value if it was not a
+        number and 1.0 was used instead, else None)
+    """
+    raw = os.environ.get('LOG_SAMPLE_RATE', '1.0')
+    try:
+        rate = float(raw)
+    except ValueError:
+        return 1.0, raw
+    return min(max(rate, 0.0), 1.0), None
+
+
+# Fraction of DEBUG/INFO records to keep (WARNING and above are always kept)
+LOG_SAMPLE_RATE, _INVALID_SAMPLE_RATE = _read_sample_rate()
+
+
+class SampleFilter(logging.Filter):
+    """
+    Filter that keeps a random fraction of records below WARNING.
+
+    Attached to the logger itself, so dropped records are never queued or
+    formatted.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Fraction of DEBUG/INFO records to keep (0.0 - 1.0)
+        """
+        super().__init__()
+        self.rate = rate
+        self._random = random.Random()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide whether a record is logged.
+
+        Args:
+            record: Log record
+
+        Returns:
+            True if the record should be logged
+        """
+        return record.levelno >= logging.WARNING or self._random.random() < self.rate
+
+
+@lru_cache(maxsize=None)
 def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
     Get a structured JSON logger for Lambda.
 
     Lambda automatically captures stdout/stderr to CloudWatch Logs,
-    so we just need to configure the formatter.
+    so we just need to configure the formatter. Records are formatted and
+    written on a background thread; see flush_logs().
+    Results are cached per (name, level), so repeated calls skip the
+    logging module's lock and handler setup.
 
     Args:
         name: Logger name (typically __name__ of the module)
@@ -86,39 +653,151 @@ def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
 
     # Only configure if not already configured
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        handler.setFormatter(JSONFormatter())
-        logger.addHandler(handler)
+        logger.addHandler(_get_handler())
         logger.setLevel(level)
 
+        if LOG_SAMPLE_RATE < 1.0:
+            logger.addFilter(SampleFilter(LOG_SAMPLE_RATE))
+
         # Prevent propagation to avoid duplicate logs
         logger.propagate = False
 
     return logger
 
 
-def log_processing_start(logger: logging.Logger, document_id: str, s3_key: str, file_type: str) -> None:
+class ContextAdapter(logging.LoggerAdapter):
+    """
+    Logger adapter that adds bound context fields to every record.
+
+    Unlike the stdlib LoggerAdapter, per-call `extra` fields are merged with
+    the bound context instead of replacing it.
+    """
+
+    def process(self, msg: Any, kwargs: MutableMapping[str, Any]) -> Tuple[Any, MutableMapping[str, Any]]:
+        """
+        Attach the bound context to the keyword arguments of a log call.
+
+        Args:
+            msg: Log message
+            kwargs: Keyword arguments of the log call
+
+        Returns:
+            Message and keyword arguments with the merged `extra`
+        """
+        extra = kwargs.get('extra')
+        kwargs['extra'] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
+
+
+def bind(logger: Union[logging.Logger, logging.LoggerAdapter], **context: Any) -> ContextAdapter:
+    """
+    Bind context fields (e.g. document_id) to a logger.
+
+    The context dict is built once and reused by every call on the returned
+    adapter, so hot paths don't rebuild an `extra` dict per log line.
+
+    Args:
+        logger: Logger, or an adapter whose context is extended
+        **context: Fields to add to every record
+
+    Returns:
+        Adapter that logs with the bound context
+    """
+    if isinstance(logger, logging.LoggerAdapter):
+        return ContextAdapter(logger.logger, {**logger.extra, **context})
+    return ContextAdapter(logger, context)
+
+
+@dataclass(slots=True)
+class DocCtx:
+    """
+    Document context attached to a processing log record.
+
+    Fields left as None are not added to the record.
+    """
+
+    document_id: str
+    s3_key: Optional[str] = None
+    file_type: Optional[str] = None
+    duration: Optional[float] = None
+    chunk_count: Optional[int] = None
+    page_count: Optional[int] = None
+    stage: Optional[str] = None
+
+
+def _emit(
+    logger: Union[logging.Logger, logging.LoggerAdapter],
+    level: int,
+    msg: str,
+    ctx: DocCtx,
+    exc_info: Optional[Tuple[Any, Any, Any]] = None
+) -> None:
+    """
+    Log a message with document context without building an `extra` dict.
+
+    The record is created directly and the context fields are set on it,
+    bypassing Logger._log's per-key extra copy. Only called by the
+    log_processing_* helpers, so the caller location recorded is that of
+    their caller, two frames up, read without findCaller()'s stack walk.
+
+    Args:
+        logger: Logger instance or bound adapter (see bind())
+        level: Logging level
+        msg: Log message
+        ctx: Document context
+        exc_info: Optional (type, value, traceback) to attach
+    """
+    bound = None
+    if isinstance(logger, logging.LoggerAdapter):
+        bound = logger.extra
+        logger = logger.logger
+
+    if not logger.isEnabledFor(level):
+        return
+
+    caller = sys._getframe(2)
+    code = caller.f_code
+    record = logger.makeRecord(
+        logger.name, level, code.co_filename, caller.f_lineno, msg, (), exc_info,
+        func=code.co_name
+    )
+    record_dict = record.__dict__
+
+    if bound:
+        record_dict.update(bound)
+    for field in DocCtx.__slots__:
+        value = getattr(ctx, field)
+        if value is not None:
+            record_dict[field] = value
+
+    logger.handle(record)
+
+
+def log_processing_start(
+    logger: Union[logging.Logger, logging.LoggerAdapter],
+    document_id: str,
+    s3_key: str,
+    file_type: str
+) -> None:
     """
     Log the start of document processing with context.
 
     Args:
-        logger: Logger instance
+        logger: Logger instance or bound adapter (see bind())
         document_id: Document UUID
         s3_key: S3 object key
         file_type: MIME type of the document
     """
-    logger.info(
+    _emit(
+        logger,
+        logging.INFO,
         "Starting document processing",
-        extra={
-            'document_id': document_id,
-            's3_key': s3_key,
-            'file_type': file_type
-        }
+        DocCtx(document_id, s3_key=s3_key, file_type=file_type)
     )
 
 
 def log_processing_complete(
-    logger: logging.Logger,
+    logger: Union[logging.Logger, logging.LoggerAdapter],
     document_id: str,
     page_count: int,
     chunk_count: int,
@@ -128,25 +807,22 @@ def log_processing_complete(
     Log successful document processing completion with metrics.
 
     Args:
-        logger: Logger instance
+        logger: Logger instance or bound adapter (see bind())
         document_id: Document UUID
         page_count: Number of pages processed
         chunk_count: Number of chunks created
         duration_ms: Processing duration in milliseconds
     """
-    logger.info(
+    _emit(
+        logger,
+        logging.INFO,
         "Document processing completed successfully",
-        extra={
-            'document_id': document_id,
-            'page_count': page_count,
-            'chunk_count': chunk_count,
-            'duration': duration_ms
-        }
+        DocCtx(document_id, duration=duration_ms, chunk_count=chunk_count, page_count=page_count)
     )
 
 
 def log_processing_error(
-    logger: logging.Logger,
+    logger: Union[logging.Logger, logging.LoggerAdapter],
     document_id: str,
     error: Exception,
     stage: str
@@ -155,18 +831,23 @@ def log_processing_error(
     Log document processing error with context.
 
     Args:
-        logger: Logger instance
+        logger: Logger instance or bound adapter (see bind())
         document_id: Document UUID
         error: Exception that occurred
         stage: Processing stage where error occurred (e.g., 'parsing', 'chunking', 'embedding')
     """
-    logger.error(
+    _emit(
+        logger,
+        logging.ERROR,
         f"Document processing failed at {stage} stage",
-        extra={
-            'document_id': document_id,
-            'stage': stage,
-            'error_type': type(error).__name__,
-            'error_message': str(error)
-        },
-        exc_info=True
+        DocCtx(document_id, stage=stage),
+        # Log the given error even when called outside its except block
+        exc_info=(type(error), error, error.__traceback__)
+    )
+
+
+# Report a malformed LOG_SAMPLE_RATE once the logging pipeline can
+if _INVALID_SAMPLE_RATE is not None:
+    get_logger(__name__).warning(
+        f"Invalid LOG_SAMPLE_RATE {_INVALID_SAMPLE_RATE!r}, logging every record"
     )